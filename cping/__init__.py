@@ -1,8 +1,39 @@
 '''Concurrect ping to multiple hosts with support for ICMP and TCP.'''
-from cping.layouts.legacy import Layout as LayoutLegacy
-from cping.layouts.modern import Layout as LayoutModern
-from cping.protocols import Host
-from cping.protocols.icmp import Ping as PingICMP
-from cping.protocols.tcp import Ping as PingTCP
+import importlib
+import sys
 
 __version__ = '0.1.12-dev'
+
+# The public classes (module, attribute), imported on first access
+_LAZY_IMPORTS = {
+    'Host': ('cping.protocols', 'Host'),
+    'LayoutLegacy': ('cping.layouts.legacy', 'Layout'),
+    'LayoutModern': ('cping.layouts.modern', 'Layout'),
+    'PingICMP': ('cping.protocols.icmp', 'Ping'),
+    'PingTCP': ('cping.protocols.tcp', 'Ping'),
+}
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
+def __getattr__(name):
+    '''Imports the public classes on demand to avoid paying for the ones not
+    being used (e.g. curses when using the legacy layout).'''
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    module, attribute = _LAZY_IMPORTS[name]
+    value = getattr(importlib.import_module(module), attribute)
+
+    # Cache it in the module so that __getattr__ isn't called again
+    globals()[name] = value
+
+    return value
+
+
+# Module-level __getattr__ was introduced in Python 3.7
+if sys.version_info < (3, 7):  # pragma: no cover
+    for _name in _LAZY_IMPORTS:
+        __getattr__(_name)
@@ -1,5 +1,6 @@
 '''Command line script.'''
 import argparse
+import functools
 import socket
 import sys
 
@@ -9,11 +10,14 @@ import cping.utils
 INTERVAL_MINIMUM = 0.1
 
 
-def args_init(args=None):
-    '''Returns the parsed arguments (an instance of argparse.Namespace).
+@functools.lru_cache()
+def args_parser(platform):
+    '''Returns the argument parser (an instance of argparse.ArgumentParser).
+    Cached as it's the same for a given platform.
 
     Args:
-        args (list): A list of program arguments, Defaults to sys.argv.
+        platform (str): The platform for which the help is formatted (i.e.
+            `sys.platform`).
     '''
     formatter = lambda prog: argparse.HelpFormatter(prog, max_help_position=30)
     parser = argparse.ArgumentParser(formatter_class=formatter)
@@ -41,7 +45,7 @@ def args_init(args=None):
     layout_help = 'display format. choices: %(choices)s (default: %(default)s)'
 
     # Suppress the layout option on Windows as it's currently limited to modern
-    if sys.platform == 'win32':
+    if platform == 'win32':
         layout_help = argparse.SUPPRESS
 
     parser.add_argument('-l',
@@ -63,6 +67,16 @@ def args_init(args=None):
                         action='version',
                         version=f'%(prog)s {cping.__version__}')
 
+    return parser
+
+
+def args_init(args=None):
+    '''Returns the parsed arguments (an instance of argparse.Namespace).
+
+    Args:
+        args (list): A list of program arguments, Defaults to sys.argv.
+    '''
+    parser = args_parser(sys.platform)
     args = parser.parse_args(args=args)
     args.family = None
 
@@ -84,6 +98,7 @@ def main(args=None):
         args (list): A list of program arguments. Defaults to sys.argv.
     '''
     args = args_init(args)
+    layout = None
 
     try:
         if args.port is not None:
@@ -105,6 +120,11 @@ def main(args=None):
         layout()
     except KeyboardInterrupt:
         pass
+    finally:
+        # Signal the ping loops to stop when used as a library (i.e. not exiting)
+        if layout is not None:
+            for host in layout.hosts:
+                host.stop()
 
 
 if __name__ == '__main__':
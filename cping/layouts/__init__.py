@@ -1,4 +1,6 @@
 '''Generic code and base classes for layouts.'''
+import threading
+
 import cping.protocols
 
 
@@ -18,8 +20,10 @@ class Layout:
             raise TypeError('protocol must be an instance of '
                             'cping.protocols.Ping')
 
-        self._hosts = []
+        self._host_padding = 0
+        self._hosts = ()
         self._protocol = protocol
+        self._update_signal = threading.Event()
 
     def __call__(self):
         '''Begins rendering the layout. If any finalizers need to run before
@@ -27,16 +31,27 @@ class Layout:
         raise NotImplementedError('cping.layouts.Layout is a base class; it '
                                   'does not implement __call__')
 
+    @property
+    def host_padding(self):
+        '''The length of the longest host name plus one.'''
+        return self._host_padding
+
     @property
     def hosts(self):
-        '''The list of hosts (instances of cping.protocols.Host).'''
-        return self._hosts.copy()
+        '''The tuple of hosts (instances of cping.protocols.Host).'''
+        return self._hosts
 
     @property
     def protocol(self):
         '''The ping protocol.'''
         return self._protocol
 
+    @property
+    def update_signal(self):
+        '''Instance of `threading.Event` that is set whenever any of the hosts'
+        `update_signal` is set. Clearing it is left to the consumer.'''
+        return self._update_signal
+
     def add_host(self, name):
         '''Adds a host to `self.hosts`. Returns the newly-created host.
 
@@ -50,7 +65,15 @@ class Layout:
             raise TypeError('name must be a string')
 
         host = self.protocol(name)
-        self._hosts.append(host)
+
+        # Patched once per host, rather than on every render, to also set the
+        # layout's update signal
+        host_set, layout_set = host.update_signal.set, self._update_signal.set
+        host.update_signal.set = lambda: (host_set(), layout_set())
+
+        # Replaced rather than mutated so `self.hosts` needs no copying
+        self._hosts = self._hosts + (host, )
+        self._host_padding = max(self._host_padding, len(name) + 1)
 
         return host
 
@@ -63,4 +86,11 @@ class Layout:
         Raises:
             ValueError: If `host` is not in `self.hosts`.
         '''
-        self._hosts.remove(host)
+        hosts = list(self._hosts)
+        hosts.remove(host)
+        self._hosts = tuple(hosts)
+
+        # Only recalculate when the longest host was removed
+        if len(str(host)) + 1 == self._host_padding:
+            self._host_padding = max((len(str(x)) + 1 for x in self._hosts),
+                                     default=0)
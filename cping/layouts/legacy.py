@@ -1,52 +1,105 @@
 '''A line-based, non-interactive layout. The "original".'''
+import os
 import shutil
+import sys
 import time
+import weakref
 
 import cping.layouts
 
+# ANSI codes of the foreground colors
+COLORS = {
+    'green': '\x1b[32m',
+    'red': '\x1b[31m',
+    'yellow': '\x1b[33m',
+    'reset': '\x1b[39m',
+}
+FRAME_INTERVAL_MINIMUM = 0.05
 HISTOGRAM_LENGTH_MINIMUM = 5
 
+# Histogram points (color, character) of a timeout, an error, and a reply
+HISTOGRAM_POINTS = (('red', '.'), ('yellow', '!'), ('green', '!'))
+
+# The output of a point given the previous one (`None` if first). Each point
+# has a distinct color, so the color code is only needed when the point changes
+HISTOGRAM_TRANSITIONS = {
+    (last, point): (COLORS[color] if last != point else '') + character
+    for last in (None, 0, 1, 2)
+    for point, (color, character) in enumerate(HISTOGRAM_POINTS)
+}
+
+STATISTICS = ('min', 'avg', 'max', 'stdev')
+STATISTICS_EMPTY = '     -  ' * 4 + '    -   '
+TERMINAL_SIZE_TTL = 0.25
+
+# The terminal size and when it's queried again (see `get_terminal_size`)
+_TERMINAL_SIZE = {'expiry': 0, 'size': None}
+
+# The last line of each host and what it was formatted from (see `get_host_line`)
+_HOST_LINES = weakref.WeakKeyDictionary()
+
 
 class Layout(cping.layouts.Layout):
     '''A line-based, non-interactive layout. The "original".'''
 
     def __call__(self):
+        # pylint: disable=not-an-iterable  # linter bug
         try:
             # Enable alternate screen buffer
             print('\x1b[?1049h', end='')
 
-            # pylint: disable=not-an-iterable  # linter bug
+            rows = []
+
             while any(host.is_running() for host in self.hosts):
-                # Move to top left, then print table
-                print(f'\x1b[H{get_table(self.hosts)}', end='', flush=True)
-                time.sleep(self.protocol.interval)
-        finally:
-            # Disable alternate screen buffer
-            print('\x1b[?1049l', end='')
+                # Clear before rendering to catch updates made in the meantime
+                self.update_signal.clear()
+
+                # Only redraw the rows that changed since the last frame
+                last_rows = rows
+                rows = get_table_rows(self.hosts,
+                                      host_padding=self.host_padding)
+
+                print(get_table_frame(rows, last_rows), end='', flush=True)
 
+                # Redraw once a host is updated; limit the rate of redraws
+                self.update_signal.wait(self.protocol.interval)
+                time.sleep(FRAME_INTERVAL_MINIMUM)
+        finally:
             # Print the last summary, including any overflowing hosts
-            print(get_table(self.hosts, all_hosts=True), end='')
+            table = get_table(self.hosts,
+                              all_hosts=True,
+                              host_padding=self.host_padding)
+
+            # Disable alternate screen buffer, then print the summary
+            print(f'\x1b[?1049l{table}', end='', flush=True)
 
 
 def format_host(host, host_padding, line_width):
     '''Returns a line representing a summary of the host's results.'''
     # line_width - host - min (8) - avg (8) - max (8) - stdev (8) - loss (8)
     host.set_results_length(line_width - host_padding - 8 * 5)
-    line = str(host).ljust(host_padding)
+    parts = [str(host).ljust(host_padding)]
+    status = host.status
 
-    if host.status:
-        return line + '   ' + host.status
+    if status:
+        return parts[0] + '   ' + status
 
-    for stat in ['min', 'avg', 'max', 'stdev']:
-        if host.results_summary[stat] is not None:
-            line += f' {host.results_summary[stat]:>7.2f}'
-        else:
-            line += '     -  '
+    # Each property access goes through the cache; fetch the summary once
+    summary = host.results_summary
 
-    if host.results_summary['loss'] is not None:
-        line += f' {host.results_summary["loss"]:>5.0%}  '
+    # The loss is only missing when all of the statistics are missing
+    if summary['loss'] is None:
+        parts.append(STATISTICS_EMPTY)
     else:
-        line += '    -   '
+        for stat in STATISTICS:
+            if summary[stat] is not None:
+                parts.append(f' {summary[stat]:>7.2f}')
+            else:
+                parts.append('     -  ')
+
+        parts.append(f' {summary["loss"]:>5.0%}  ')
+
+    line = ''.join(parts)
 
     return line + get_histogram(host, line_width - len(line))
 
@@ -54,63 +107,135 @@ def format_host(host, host_padding, line_width):
 def get_color(color, last_color=None):
     '''Returns the ANSI code for `color`, taking in mind `last_color` to skip
     unnecessary color codes. `color` can be green, red, yellow, and reset'''
-    if color != last_color:
-        return {
-            'green': '\x1b[32m',
-            'red': '\x1b[31m',
-            'yellow': '\x1b[33m',
-            'reset': '\x1b[39m',
-        }.get(color, '')
-
-    return ''
+    return COLORS.get(color, '') if color != last_color else ''
 
 
 def get_histogram(host, length):
     '''Returns an ANSI-colored string representing the host's results.'''
     # Output optimization by only including color markers when the color changes
-    line = ''
+    parts = []
     length = max(length, HISTOGRAM_LENGTH_MINIMUM)
-    last_color = None
+    last_point = None
+
+    # Local references for the loop (avoids global and attribute lookups)
+    append = parts.append
+    transitions = HISTOGRAM_TRANSITIONS
 
-    for result in list(host.results)[-length:]:
+    for result in host.results[-length:]:
+        # The index of the result's point in HISTOGRAM_POINTS
         if result['latency'] == -1:
-            line += get_color('red', last_color) + '.'
-            last_color = 'red'
+            point = 0
         else:
-            color = 'green' if not result['error'] else 'yellow'
-            line += get_color(color, last_color) + '!'
-            last_color = color
+            point = 1 if result['error'] else 2
+
+        append(transitions[last_point, point])
+        last_point = point
 
     # Include a color reset at the end of the line
-    return line + get_color('reset')
+    parts.append(COLORS['reset'])
+
+    return ''.join(parts)
+
+
+def get_terminal_size():
+    '''Returns the size of the terminal connected to stdout, cached for
+    `TERMINAL_SIZE_TTL` seconds to avoid querying it on every frame. Falls back
+    to `shutil.get_terminal_size()` if stdout isn't a terminal or it reports a
+    size of zero (e.g. some serial consoles and pseudo-terminals).'''
+    now = time.monotonic()
+
+    if now >= _TERMINAL_SIZE['expiry']:
+        _TERMINAL_SIZE['expiry'] = now + TERMINAL_SIZE_TTL
+
+        try:
+            size = os.get_terminal_size(sys.__stdout__.fileno())
+        except (AttributeError, OSError, ValueError):
+            size = None
+
+        if not size or not size.columns or not size.lines:
+            size = shutil.get_terminal_size()
+
+        _TERMINAL_SIZE['size'] = size
+
+    return _TERMINAL_SIZE['size']
+
+
+def get_host_line(host, host_padding, line_width):
+    '''Returns `format_host(host, host_padding, line_width)`, reusing the line
+    from the previous call if neither the host nor the arguments changed.'''
+    key = (host.changes, host_padding, line_width)
+    cached = _HOST_LINES.get(host)
 
+    if cached is None or cached[0] != key:
+        cached = (key, format_host(host, host_padding, line_width))
+        _HOST_LINES[host] = cached
 
-def get_table(hosts, all_hosts=False):
+    return cached[1]
+
+
+def get_table(hosts, all_hosts=False, host_padding=None):
     '''Returns a table (string) of the hosts' results.
 
     Args:
         hosts (list): A list... of hosts... Yeah.
         all_hosts (bool): If `False`, table won't exceed screen's height.
+        host_padding (int): Passed to `get_table_rows`.
+    '''
+    rows = get_table_rows(hosts, all_hosts, host_padding)
+
+    # Clear to end of each line, then clear to end of screen
+    return ''.join(row + '\x1b[K\n' for row in rows) + '\x1b[J'
+
+
+def get_table_frame(rows, last_rows):
+    '''Returns the output (string) that updates the screen from `last_rows` to
+    `rows` by only redrawing the rows that changed.
+
+    Args:
+        rows (list): The rows to be shown (i.e. `get_table_rows`).
+        last_rows (list): The rows currently on the screen.
+    '''
+    output = []
+
+    for index, row in enumerate(rows):
+        if index >= len(last_rows) or row != last_rows[index]:
+            # Move to the start of the row, then clear to end of line
+            output.append(f'\x1b[{index + 1};1H{row}\x1b[K')
+
+    # Clear the rows that are no longer shown
+    if len(rows) < len(last_rows):
+        output.append(f'\x1b[{len(rows) + 1};1H\x1b[J')
+
+    return ''.join(output)
+
+
+def get_table_rows(hosts, all_hosts=False, host_padding=None):
+    '''Returns a list of rows (strings), one for each host, followed by the
+    count of hosts that overflowed, if any.
+
+    Args:
+        hosts (list): The hosts upon which the rows are based.
+        all_hosts (bool): If `False`, the rows won't exceed screen's height.
+        host_padding (int): Width of the host column. Calculated from `hosts`
+            if `None` (see `cping.layouts.Layout.host_padding`).
     '''
-    table = ''
-    term_size = shutil.get_terminal_size()
-    host_padding = max(len(str(x)) for x in hosts) + 1
+    term_size = get_terminal_size()
 
-    for index, host in enumerate(hosts):
-        # Not printing all hosts and lines limit reached
-        if not all_hosts and index >= term_size.lines - 1:
-            break
+    if host_padding is None:
+        host_padding = max(len(str(x)) for x in hosts) + 1
 
-        host_line = format_host(host, host_padding, term_size.columns)
+    hosts_count = len(hosts)
 
-        # Clear to end of line
-        table += host_line + '\x1b[K\n'
+    # Not printing all hosts; limit to the screen's height (minus the footer)
+    if not all_hosts:
+        hosts = hosts[:max(term_size.lines - 1, 0)]
 
-    # Clear to end of screen
-    table += '\x1b[J'
+    rows = [
+        get_host_line(host, host_padding, term_size.columns) for host in hosts
+    ]
 
     # Not printing all hosts and some hosts overflowed
-    if not all_hosts and len(hosts) > term_size.lines - 1:
-        table += f'+{len(hosts) - (term_size.lines - 1)} more'
+    if hosts_count > len(hosts):
+        rows.append(f'+{hosts_count - len(hosts)} more')
 
-    return table
+    return rows
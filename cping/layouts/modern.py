@@ -1,7 +1,12 @@
 '''Curses-based interactive window.'''
+import collections
 import curses
+import functools
+import itertools
 import math
 import sys
+import time
+import weakref
 
 import cping.layouts
 import cping.protocols
@@ -9,6 +14,24 @@ import cping.utils
 
 COLUMN_DELIMITER = '  '
 COLUMN_WIDTH_MINIMUM = 6
+FRAME_INTERVAL_MINIMUM = 0.05
+
+# The sort key functions of the table columns (see `sort_hosts`)
+SORT_KEYS = {
+    1: lambda host: cping.utils.natural_ordering_sort_key(str(host)),
+    2: lambda host: host_results_sort_key(host, 'min'),
+    3: lambda host: host_results_sort_key(host, 'avg'),
+    4: lambda host: host_results_sort_key(host, 'max'),
+    5: lambda host: host_results_sort_key(host, 'stdev'),
+    6: lambda host: host_results_sort_key(host, 'loss'),
+}
+
+# Windows doesn't support the block characters of the sparkline
+SPARKLINE_BLOCKS = sys.platform != 'win32'
+SPARKLINE_TIMEOUT = '░' if SPARKLINE_BLOCKS else '.'
+
+# The last columns of each host and what they were built from
+_HOST_COLUMNS = weakref.WeakKeyDictionary()
 
 
 class Layout(cping.layouts.Layout):
@@ -40,37 +63,94 @@ class Layout(cping.layouts.Layout):
             host (cping.protocols.Host): Source of the sparkline's data.
             length (int): The maximum length of the sparkline.
         '''
-        for result in list(host.results)[-length:]:
-            if result['latency'] == -1:
-                color = 'red'
-                point = '.' if sys.platform == 'win32' else '░'
+        # Read once as a late reply may update a result in the meantime
+        results = [(x['latency'], x['error']) for x in host.results[-length:]]
+        points = []
+
+        if SPARKLINE_BLOCKS:
+            # Normalize the latencies of the results in one go
+            summary = host.results_summary
+            blocks = iter(
+                cping.utils.sparkline_points(
+                    (x * 1000 for x, _ in results if x != -1),
+                    summary['min'],
+                    summary['max'],
+                    summary['stdev'],
+                ))
+
+        for latency, error in results:
+            if latency == -1:
+                points.append(('red', SPARKLINE_TIMEOUT))
             else:
-                color = 'yellow' if result['error'] else 'green'
-                point = '!'
+                color = 'yellow' if error else 'green'
+                points.append((color, next(blocks) if SPARKLINE_BLOCKS else '!'))
+
+        if not points:
+            return
 
-                if sys.platform != 'win32':
-                    point = cping.utils.sparkline_point(
-                        result['latency'] * 1000,
-                        host.results_summary['min'],
-                        host.results_summary['max'],
-                        host.results_summary['stdev'],
-                    )
+        # Add all of the points in the most common color with a single call
+        common = collections.Counter(x[0] for x in points).most_common(1)[0][0]
+        text = ''.join(point for _, point in points)
+        color = Layout.colors.get(common, curses.A_NORMAL)
+        window.addstr(line, column, text, color)
 
-            color = Layout.colors.get(color, curses.A_NORMAL)
-            window.addstr(line, column, point, color)
+        # Overlay consecutive points of the other colors, one call per run
+        for color, run in itertools.groupby(points, key=lambda x: x[0]):
+            text = ''.join(point for _, point in run)
 
-            # Shift to next point
-            column += 1
+            if color != common:
+                color = Layout.colors.get(color, curses.A_NORMAL)
+                window.addstr(line, column, text, color)
+
+            # Shift to the point after the run
+            column += len(text)
 
     @staticmethod
-    def render_table(window, table, selection):
+    def render_row(window, index, row, columns, clear):
+        '''Calls `window.addnstr` to render the row, followed by the sparkline
+        of its host, if any.
+
+        Args:
+            window (curses.window): Window to which the row is rendered.
+            index (int): The line on which the row is rendered.
+            row (dict): The row of the table (i.e. `get_table`).
+            columns (int): The width of the window.
+            clear (bool): Clear the leftovers of the previous row first.
+        '''
+        if clear:
+            window.move(index, 0)
+            window.clrtoeol()
+
+        window.addnstr(index, 0, row['line'], columns, row['attrs'])
+
+        # Add the sparkline if this isn't the header
+        sparkline_length = columns - len(row['line'])
+
+        if row.get('host') and sparkline_length > 0:
+            row['host'].set_results_length(sparkline_length)
+            Layout.render_sparkline(
+                window,
+                index,
+                len(row['line']),
+                row['host'],
+                sparkline_length,
+            )
+
+    @staticmethod
+    def render_table(window, table, selection, frame=None):
         '''Calls `window.addnstr` to render the table based on the selection.
+        Only the rows that changed since the previous frame are redrawn.
 
         Args:
             window (curses.window): Window to which the table is rendered.
             table (list): The results table (i.e. `get_table`).
             selection (int): The index of the selected row.
+            frame (dict): The state of the previous frame rendered to `window`,
+                updated in place. If `None`, the whole table is redrawn.
         '''
+        if frame is None:
+            frame = {}
+
         lines, columns = window.getmaxyx()
 
         page = get_table_page(table, lines - 1, selection)
@@ -81,7 +161,10 @@ class Layout(cping.layouts.Layout):
         footer = footer.ljust(columns)
 
         try:
-            window.erase()
+            # Redraw everything if it's the first frame or the size changed
+            if frame.get('size') != (lines, columns):
+                window.erase()
+                frame.update(size=(lines, columns), rows={})
 
             # Add the page to the window
             for index, row in enumerate(page):
@@ -93,28 +176,39 @@ class Layout(cping.layouts.Layout):
                 if index == selection % (lines - 1):
                     row['attrs'] |= curses.A_BOLD
 
-                window.addnstr(index, 0, row['line'], columns, row['attrs'])
-
-                # Add the sparkline if this isn't the header
-                if row.get('host'):
-                    sparkline_length = columns - len(row['line'])
-
-                    if sparkline_length > 0:
-                        row['host'].set_results_length(sparkline_length)
-                        Layout.render_sparkline(
-                            window,
-                            index,
-                            len(row['line']),
-                            row['host'],
-                            sparkline_length,
-                        )
+                # The host's changes account for its results (i.e. sparkline)
+                host = row.get('host')
+                state = (
+                    (row['line'], row['attrs']),
+                    (host, host and host.changes, len(row['line'])),
+                )
+
+                previous = frame['rows'].get(index, (None, None))
+                frame['rows'][index] = state
+
+                # Clear the leftovers of the previous row, if any
+                if previous[1] != state[1]:
+                    Layout.render_row(window, index, row, columns,
+                                      previous[0] is not None)
+                elif previous[0] != state[0]:
+                    # Same length as the previous line; the sparkline stays
+                    window.addnstr(index, 0, row['line'], columns, row['attrs'])
+
+            # Clear the rows that are no longer in the page
+            for index in range(len(page), lines - 1):
+                if frame['rows'].pop(index, None) is not None:
+                    window.move(index, 0)
+                    window.clrtoeol()
 
             # Add a footer to the bottom of the screen
             window.addnstr(lines - 1, 0, footer, columns, curses.A_STANDOUT)
-            window.refresh()
+
+            # Write out the frame to the terminal in a single update
+            window.noutrefresh()
+            curses.doupdate()
         except curses.error:
-            # Triggers when excessively resizing the window
-            pass
+            # Triggers when excessively resizing the window; redraw next time
+            frame.clear()
 
     def render(self, window):
         '''Start rendering the layout. Blocking function meant to be called with
@@ -122,15 +216,24 @@ class Layout(cping.layouts.Layout):
         # pylint: disable=too-many-branches,not-an-iterable  # linter bug
         Layout.initialize_colors()
 
-        # Set the timeout (ms) for `windows.getch`
-        window.timeout(int(self.protocol.interval * 1000))
+        # Set the timeout (ms) for `windows.getch`; polled for input frequently
+        window.timeout(int(FRAME_INTERVAL_MINIMUM * 1000))
 
         # State tracking
-        button = selection = show_address = sort_key = 0
+        button = selection = show_address = sort_key = render_time = 0
+        frame = {}
 
         while button != ord('q'):
-            table = get_table(self.hosts, sort_key, show_address=show_address)
-            Layout.render_table(window, table, selection)
+            # Redraw on input or host updates, but at least once per interval
+            redraw = button != -1 or self.update_signal.is_set()
+            redraw |= time.monotonic() - render_time >= self.protocol.interval
+
+            if redraw:
+                self.update_signal.clear()
+                render_time = time.monotonic()
+
+                table = get_table(self.hosts, sort_key, show_address)
+                Layout.render_table(window, table, selection, frame)
 
             # Clear burst mode to avoid sticking while waiting on getch
             for host in self.hosts:
@@ -169,34 +272,44 @@ class Layout(cping.layouts.Layout):
                 sort_key = get_table_sort_key(button % 48, sort_key)
 
             # Flush input buffer to remove queued keys pressed during processing
-            curses.flushinp()
+            if button != -1:
+                curses.flushinp()
 
 
 def get_host_columns(host, show_address=False):
-    '''Returns a list of strings containing host, min, avg, max, stdev, loss.
+    '''Returns a tuple of strings containing host, min, avg, max, stdev, loss.
+    The columns are cached until the host changes.
 
     Args:
         host (cping.protocols.Host): Host from which to get the details.
     '''
-    columns = [str(host)]
+    key = (host.changes, show_address, getattr(host, 'addrinfo', None))
+    cached = _HOST_COLUMNS.get(host)
 
-    if show_address and hasattr(host, 'addrinfo'):
-        address = host.addrinfo[4][0]
+    if cached is None or cached[0] != key:
+        columns = [str(host)]
 
-        if host.name != address:
-            columns[0] += f' {address}'
+        if show_address and hasattr(host, 'addrinfo'):
+            address = host.addrinfo[4][0]
 
-    for stat in ['min', 'avg', 'max', 'stdev', 'loss']:
-        if host.results_summary[stat] is None:
-            columns.append('-  ')
-            continue
+            if host.name != address:
+                columns[0] += f' {address}'
+
+        for stat in ['min', 'avg', 'max', 'stdev', 'loss']:
+            if host.results_summary[stat] is None:
+                columns.append('-  ')
+                continue
+
+            if stat == 'loss':
+                columns.append(f'{host.results_summary[stat]:.0%} ')
+            else:
+                columns.append(f'{host.results_summary[stat]:.2f}')
 
-        if stat == 'loss':
-            columns.append(f'{host.results_summary[stat]:.0%} ')
-        else:
-            columns.append(f'{host.results_summary[stat]:.2f}')
+        # Immutable so that the cached columns can be returned without a copy
+        cached = (key, tuple(columns))
+        _HOST_COLUMNS[host] = cached
 
-    return columns
+    return cached[1]
 
 
 def get_table(hosts, sort_key=0, show_address=False):
@@ -227,13 +340,16 @@ def get_table(hosts, sort_key=0, show_address=False):
 
         table.append(row)
 
-    # Calculate the maximum width of each column among all rows
-    column_widths = [COLUMN_WIDTH_MINIMUM] * 6
+    # Calculate the maximum width of each column among all rows; transposed so
+    # that each column is a single pass over its values
+    column_widths = [
+        max(COLUMN_WIDTH_MINIMUM, *map(len, column))
+        for column in zip(*(row['columns'] for row in table))
+    ]
 
-    for column in range(6):
-        for row in table:
-            column_width = len(row['columns'][column])
-            column_widths[column] = max(column_width, column_widths[column])
+    # The Host column is left justified; the rest are right justified
+    template = COLUMN_DELIMITER.join([f'{{:<{column_widths[0]}}}'] +
+                                     [f'{{:>{x}}}' for x in column_widths[1:]])
 
     # Align columns and store the resulting string into the `line` key
     for row in table:
@@ -246,22 +362,14 @@ def get_table(hosts, sort_key=0, show_address=False):
             row['line'] = row['line'].ljust(padding)[:padding]
             continue
 
-        for column in range(6):
-            # The Host column is left justified
-            if column == 0:
-                value = row['columns'][column].ljust(column_widths[column])
-            else:
-                value = row['columns'][column].rjust(column_widths[column])
-
-            row['columns'][column] = value
-
-        row['line'] = COLUMN_DELIMITER.join(row['columns'])
+        row['line'] = template.format(*row['columns'])
 
     return table
 
 
+@functools.lru_cache(maxsize=256)
 def get_table_footer(page_count, page_number):
-    '''Returns a footer (string) for a table.
+    '''Returns a footer (string) for a table. Cached as it's called per frame.
 
     Args:
         page_count (int): The total number of pages.
@@ -289,14 +397,9 @@ def get_table_page(table, size, selection):
         size (int): Number of rows to return in the page.
         selection (int): The index of the item to be highlighted.
     '''
-    page = []
+    start = selection // size * size
 
-    for index, row in enumerate(table):
-        # Row in the selected page
-        if index // size == selection // size:
-            page.append(row)
-
-    return page
+    return table[start:start + size]
 
 
 def get_table_sort_key(new, current):
@@ -334,17 +437,11 @@ def sort_hosts(hosts, sort_key=0):
             at 1, the column numbers map to: host, min, avg, max, stdev, and
             loss.
     '''
-    sort_keys = {
-        1: lambda host: cping.utils.natural_ordering_sort_key(str(host)),
-        2: lambda host: host_results_sort_key(host, 'min'),
-        3: lambda host: host_results_sort_key(host, 'avg'),
-        4: lambda host: host_results_sort_key(host, 'max'),
-        5: lambda host: host_results_sort_key(host, 'stdev'),
-        6: lambda host: host_results_sort_key(host, 'loss'),
-    }
-
     # Get the respective lambda sort key, defaulting to no sorting
-    key = sort_keys.get(abs(sort_key or 0), lambda host: 0)
+    key = SORT_KEYS.get(abs(sort_key or 0))
     reverse = isinstance(sort_key, int) and sort_key < 0
 
+    if key is None:
+        return list(hosts)
+
     return sorted(hosts, key=key, reverse=reverse)
@@ -22,6 +22,18 @@ class TestLayout(unittest.TestCase):
         with self.assertRaisesRegex(TypeError, 'name must be a string'):
             layout.add_host(None)
 
+    def test_host_padding(self):
+        '''The host padding tracks the longest host name.'''
+        layout = cping.layouts.Layout(cping.protocols.Ping())
+        self.assertEqual(layout.host_padding, 0)
+
+        layout.add_host('123')
+        host = layout.add_host('12345')
+        self.assertEqual(layout.host_padding, 6)
+
+        layout.remove_host(host)
+        self.assertEqual(layout.host_padding, 4)
+
     def test_remove_host(self):
         '''Add a host.'''
         layout = cping.layouts.Layout(cping.protocols.Ping())
@@ -52,8 +64,8 @@ class TestLayout(unittest.TestCase):
         '''Layout's hosts attribute is read only.'''
         layout = cping.layouts.Layout(cping.protocols.Ping())
 
-        # Confirm a copy is returned
-        self.assertIsNot(layout.hosts, layout.hosts)
+        # Confirm an immutable sequence is returned
+        self.assertIsInstance(layout.hosts, tuple)
 
         with self.assertRaisesRegex(AttributeError, 'can.t set attribute'):
             layout.hosts = None
@@ -67,6 +79,20 @@ class TestLayout(unittest.TestCase):
         with self.assertRaisesRegex(AttributeError, 'can.t set attribute'):
             layout.protocol = None
 
+    def test_update_signal(self):
+        '''The update signal is set when any of the hosts is updated.'''
+        layout = cping.layouts.Layout(cping.protocols.Ping())
+        host1 = layout.add_host('host1')
+        host2 = layout.add_host('host2')
+        self.assertFalse(layout.update_signal.is_set())
+
+        host1.add_result(1)
+        self.assertTrue(layout.update_signal.is_set())
+        layout.update_signal.clear()
+
+        host2.status = 'Some status'
+        self.assertTrue(layout.update_signal.is_set())
+
     def test___call__(self):
         '''Ensure __call__ raises NotImplementedError.'''
         with self.assertRaises(NotImplementedError):
@@ -1,9 +1,12 @@
 '''cping.layouts.legacy tests'''
 import contextlib
 import io
+import os
 import re
 import threading
 import unittest
+import unittest.mock
+import weakref
 
 import cping.layouts.legacy
 import cping.protocols
@@ -30,19 +33,37 @@ class TestLayout(unittest.TestCase):
             exit_signal.set()
             layout_thread.join()
 
+        output = output.getvalue()
+
         # Enter alternate buffer and move to 1;1
-        self.assertTrue(output.getvalue().startswith('\x1b[?1049h\x1b[H'))
+        self.assertTrue(output.startswith('\x1b[?1049h\x1b[1;1H'))
 
         # Exit alternate buffer
-        self.assertIn('\x1b[?1049l', output.getvalue())
+        self.assertIn('\x1b[?1049l', output)
+
+    def test___call___repeated(self):
+        '''Calling the layout again shouldn't patch the hosts' signals again.'''
+        layout = cping.layouts.legacy.Layout(cping.protocols.Ping())
+        host = layout.add_host('host1')
+        patched_set = host.update_signal.set
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            layout()
+            layout()
+
+        self.assertIs(host.update_signal.set, patched_set)
 
 
 class TestFormatHost(unittest.TestCase):
     '''cping.layouts.legacy.format_host tests.'''
 
+    @classmethod
+    def setUpClass(cls):
+        cls.ping = cping.protocols.Ping()
+
     def test_host_status(self):
         '''The host's status, if set, should be shown.'''
-        host = cping.protocols.Ping()('localhost')
+        host = self.ping('localhost')
         host.status = 'Test status'
 
         line = cping.layouts.legacy.format_host(host, 4, 80)
@@ -50,18 +71,25 @@ class TestFormatHost(unittest.TestCase):
 
     def test_line_width(self):
         '''The line-width should update the host's results length.'''
-        host = cping.protocols.Ping()('localhost')
+        host = self.ping('localhost')
         old_length = host.raw_results.maxlen
 
         cping.layouts.legacy.format_host(host, 4, 150)
         self.assertGreater(host.raw_results.maxlen, old_length)
 
+    def test_no_statistics(self):
+        '''Place-holders are shown when there are no statistics.'''
+        host = self.ping('localhost')
+        host.add_result(-1)
+
+        line = cping.layouts.legacy.format_host(host, 10, 80)
+        self.assertTrue(line.startswith('localhost      -       -  '))
+
     def test_statistics(self):
         '''The host's statistics are shown.'''
-        host = cping.protocols.Ping()('localhost')
+        host = self.ping('localhost')
 
-        for result in [-1, -1, 1, 2]:
-            host.add_result(result)
+        host.add_results([-1, -1, 1, 2])
 
         line = cping.layouts.legacy.format_host(host, 4, 80)
         self.assertIn(' 1000.00', line)
@@ -78,12 +106,22 @@ class TestGetHistogram(unittest.TestCase):
         '''Ensure the results are correctly represented.'''
         host = cping.protocols.Ping()('localhost')
 
-        for result in [-1, 0, -1, -1, 0]:
-            host.add_result(result)
+        host.add_results([-1, 0, -1, -1, 0])
 
         line = cping.layouts.legacy.get_histogram(host, 80)
         self.assertIn('.!..!', strip_colors(line))
 
+    def test_results_colors(self):
+        '''Color codes are only included when the color changes.'''
+        host = cping.protocols.Ping()('localhost')
+
+        host.add_results([-1, -1, 0, 0])
+
+        host.add_result(0, True)
+
+        line = cping.layouts.legacy.get_histogram(host, 80)
+        self.assertEqual(line, '\x1b[31m..\x1b[32m!!\x1b[33m!\x1b[39m')
+
 
 class TestGetColor(unittest.TestCase):
     '''cping.layouts.legacy.get_color tests.'''
@@ -101,20 +139,121 @@ class TestGetColor(unittest.TestCase):
         self.assertEqual(cping.layouts.legacy.get_color('hi'), '')
 
 
+class TestGetHostLine(unittest.TestCase):
+    '''cping.layouts.legacy.get_host_line tests.'''
+
+    def setUp(self):
+        # Start every test without cached lines
+        patcher = unittest.mock.patch('cping.layouts.legacy._HOST_LINES',
+                                      weakref.WeakKeyDictionary())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cache(self):
+        '''The line is only reformatted when the host or arguments change.'''
+        host = cping.protocols.Ping()('localhost')
+        function = 'cping.layouts.legacy.format_host'
+
+        with unittest.mock.patch(function, return_value='line') as mock:
+            cping.layouts.legacy.get_host_line(host, 4, 80)
+            cping.layouts.legacy.get_host_line(host, 4, 80)
+            self.assertEqual(mock.call_count, 1)
+
+            host.add_result(1)
+            cping.layouts.legacy.get_host_line(host, 4, 80)
+            self.assertEqual(mock.call_count, 2)
+
+            cping.layouts.legacy.get_host_line(host, 4, 100)
+            self.assertEqual(mock.call_count, 3)
+
+
 class TestGetTable(unittest.TestCase):
     '''cping.layouts.legacy.get_table tests.'''
 
+    @classmethod
+    def setUpClass(cls):
+        # More hosts than can fit on the screen
+        ping = cping.protocols.Ping()
+        cls.hosts = [ping(str(x)) for x in range(60)]
+
     def test_overflow(self):
         '''Create a table with too many hosts to ensure they don't overflow.'''
-        hosts = [cping.protocols.Ping()(str(x)) for x in range(60)]
-
-        table = cping.layouts.legacy.get_table(hosts)
+        table = cping.layouts.legacy.get_table(self.hosts)
         self.assertIn(' more', table)
 
-        table = cping.layouts.legacy.get_table(hosts, all_hosts=True)
+        table = cping.layouts.legacy.get_table(self.hosts, all_hosts=True)
         self.assertNotIn(' more', table)
 
 
-def strip_colors(data):
+class TestGetTerminalSize(unittest.TestCase):
+    '''cping.layouts.legacy.get_terminal_size tests.'''
+
+    def setUp(self):
+        # Start every test without a cached size
+        self.cache = {'expiry': 0, 'size': None}
+        patcher = unittest.mock.patch('cping.layouts.legacy._TERMINAL_SIZE',
+                                      self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cache(self):
+        '''The terminal size is cached until the TTL expires.'''
+        function = 'os.get_terminal_size'
+        size = os.terminal_size((80, 24))
+
+        with unittest.mock.patch(function, return_value=size) as mock:
+            cping.layouts.legacy.get_terminal_size()
+            cping.layouts.legacy.get_terminal_size()
+            self.assertEqual(mock.call_count, 1)
+
+            self.cache['expiry'] = 0
+            cping.layouts.legacy.get_terminal_size()
+            self.assertEqual(mock.call_count, 2)
+
+    def test_not_a_terminal(self):
+        '''Fall back to `shutil.get_terminal_size` if stdout isn't a terminal.'''
+        with unittest.mock.patch('os.get_terminal_size', side_effect=OSError):
+            with unittest.mock.patch('shutil.get_terminal_size') as mock:
+                mock.return_value = (100, 50)
+                size = cping.layouts.legacy.get_terminal_size()
+                self.assertEqual(size, (100, 50))
+
+    def test_zero_size(self):
+        '''Fall back to `shutil.get_terminal_size` if the terminal reports a size
+        of zero.'''
+        function = 'os.get_terminal_size'
+
+        for size in [(0, 0), (80, 0), (0, 24)]:
+            self.cache['expiry'] = 0
+            size = os.terminal_size(size)
+
+            with unittest.mock.patch(function, return_value=size):
+                with unittest.mock.patch('shutil.get_terminal_size') as mock:
+                    mock.return_value = (100, 50)
+                    result = cping.layouts.legacy.get_terminal_size()
+                    self.assertEqual(result, (100, 50))
+
+
+class TestGetTableFrame(unittest.TestCase):
+    '''cping.layouts.legacy.get_table_frame tests.'''
+
+    def test_changed_rows(self):
+        '''Only the rows that changed are redrawn.'''
+        frame = cping.layouts.legacy.get_table_frame(['a', 'b', 'c'],
+                                                     ['a', 'x', 'c'])
+        self.assertEqual(frame, '\x1b[2;1Hb\x1b[K')
+
+    def test_removed_rows(self):
+        '''Rows that are no longer shown are cleared.'''
+        frame = cping.layouts.legacy.get_table_frame(['a'], ['a', 'b'])
+        self.assertEqual(frame, '\x1b[2;1H\x1b[J')
+
+    def test_unchanged(self):
+        '''Nothing is redrawn if the rows didn't change.'''
+        frame = cping.layouts.legacy.get_table_frame(['a', 'b'], ['a', 'b'])
+        self.assertEqual(frame, '')
+
+
+def strip_colors(data, _regex=re.compile(r'\x1b\[\d*m')):
     '''Remove the ANSI foreground colors from the string `data`.'''
-    return re.sub(r'\x1b\[\d*m', '', data)
+    return _regex.sub('', data)
@@ -1,19 +1,56 @@
 '''cping.layouts.modern tests'''
-# pylint: disable=not-an-iterable,unsubscriptable-object
+# pylint: disable=not-an-iterable,too-many-public-methods,unsubscriptable-object
 import curses
 import threading
 import unittest
 import unittest.mock
+import weakref
 
 import cping.layouts.modern
 import cping.protocols
+import cping.utils
 
 # Regarding `mock_calls[x][1][y]`, `args` was introduced in Python 3.8
 
+# Curses functions which require `curses.initscr`; patched for the whole module
+CURSES_PATCHES = [
+    unittest.mock.patch('curses.color_pair', lambda x: x),
+    unittest.mock.patch('curses.doupdate', lambda: None),
+    unittest.mock.patch('curses.flushinp', lambda: None),
+    unittest.mock.patch('curses.init_pair', lambda *_: None),
+]
+
+
+def setUpModule():  # pylint: disable=invalid-name
+    '''Patch the curses functions before any of the tests run.'''
+    for patcher in CURSES_PATCHES:
+        patcher.start()
+
+
+def tearDownModule():  # pylint: disable=invalid-name
+    '''Restore the curses functions once all of the tests ran.'''
+    for patcher in CURSES_PATCHES:
+        patcher.stop()
+
 
 class TestLayout(unittest.TestCase):
     '''cping.layouts.modern.Layout tests.'''
 
+    @staticmethod
+    def create_layout():
+        '''Returns a layout with two hosts. The hosts' start, stop, and burst
+        mode functions are replaced with mocks.'''
+        layout = cping.layouts.modern.Layout(cping.protocols.Ping())
+
+        for name in ['host1', 'host2']:
+            host = layout.add_host(name)
+            host.burst_mode.set = unittest.mock.MagicMock()
+            host.burst_mode.clear = unittest.mock.MagicMock()
+            host.start = unittest.mock.MagicMock()
+            host.stop = unittest.mock.MagicMock()
+
+        return layout
+
     @staticmethod
     def wrap_curses_getch(keys):
         '''Returns a callable that will return `keys` one at a time per call.
@@ -28,10 +65,6 @@ class TestLayout(unittest.TestCase):
 
         return getch
 
-    def setUp(self):
-        curses.init_pair = lambda *_: None
-        curses.color_pair = lambda x: x
-
     def test___call__(self):
         '''Confirm `__call__` calls `render`.'''
         layout = cping.layouts.modern.Layout(cping.protocols.Ping())
@@ -39,22 +72,27 @@ class TestLayout(unittest.TestCase):
 
         trigger = threading.Event()
         layout.render = lambda x: x.set()
-        curses.wrapper = lambda x: x(trigger)
 
-        layout()
+        with unittest.mock.patch('curses.wrapper', lambda x: x(trigger)):
+            layout()
+
         self.assertTrue(trigger.is_set())
 
     def test_initialize_colors(self):
         '''Confirm `initialize_colors` populates `Layout.colors`.'''
         colors = ['green', 'red', 'yellow']
 
-        for color in colors:
-            self.assertIsNone(cping.layouts.modern.Layout.colors.get(color))
+        # Start empty regardless of the tests that already ran `render`
+        with unittest.mock.patch.dict(cping.layouts.modern.Layout.colors,
+                                      clear=True):
+            for color in colors:
+                self.assertIsNone(cping.layouts.modern.Layout.colors.get(color))
 
-        cping.layouts.modern.Layout.initialize_colors()
+            cping.layouts.modern.Layout.initialize_colors()
 
-        for color in colors:
-            self.assertIsNotNone(cping.layouts.modern.Layout.colors.get(color))
+            for color in colors:
+                self.assertIsNotNone(
+                    cping.layouts.modern.Layout.colors.get(color))
 
     def test_render_sparkline(self):
         '''`render_sparkline` should call `window.addstr`.'''
@@ -64,6 +102,7 @@ class TestLayout(unittest.TestCase):
         host.add_result(0.2, True)
         host.add_result(-1)
 
+        cping.layouts.modern.Layout.initialize_colors()
         window = unittest.mock.MagicMock()
         cping.layouts.modern.Layout.render_sparkline(window, 1, 2, host, 3)
 
@@ -86,9 +125,67 @@ class TestLayout(unittest.TestCase):
         self.assertEqual(window.mock_calls[2][1][1], 4)
         self.assertEqual(window.mock_calls[2][1][3], red)
 
+    def test_render_sparkline_color_runs(self):
+        '''The points are added in the most common color, then overlaid by the
+        runs of the other colors.'''
+        host = cping.protocols.Ping()('localhost')
+        host.add_result(0.1)
+        host.add_result(-1)
+        host.add_result(-1)
+        host.add_result(0.2)
+        host.add_result(0.3)
+
+        cping.layouts.modern.Layout.initialize_colors()
+        window = unittest.mock.MagicMock()
+        cping.layouts.modern.Layout.render_sparkline(window, 1, 2, host, 5)
+
+        green = cping.layouts.modern.Layout.colors.get('green')
+        red = cping.layouts.modern.Layout.colors.get('red')
+
+        self.assertEqual(len(window.mock_calls), 2)
+
+        self.assertEqual(window.mock_calls[0][1][1], 2)
+        self.assertEqual(len(window.mock_calls[0][1][2]), 5)
+        self.assertEqual(window.mock_calls[0][1][3], green)
+
+        self.assertEqual(window.mock_calls[1][1][1], 3)
+        self.assertEqual(len(window.mock_calls[1][1][2]), 2)
+        self.assertEqual(window.mock_calls[1][1][3], red)
+
+    def test_render_sparkline_late_reply(self):
+        '''A late reply updating a result while rendering shouldn't break it.'''
+        host = cping.protocols.Ping()('localhost')
+        host.add_result(0.1)
+        result = host.add_result(-1)
+
+        sparkline_points = cping.utils.sparkline_points
+
+        def late_reply(*args):
+            points = list(sparkline_points(*args))
+            host.update_result(result, latency=0.2, error=True)
+            return points
+
+        cping.layouts.modern.Layout.initialize_colors()
+        window = unittest.mock.MagicMock()
+
+        with unittest.mock.patch('cping.utils.sparkline_points', late_reply):
+            cping.layouts.modern.Layout.render_sparkline(window, 1, 2, host, 2)
+
+        # Rendered as it was before the update
+        self.assertEqual(window.mock_calls[1][1][2], '░')
+
+    def test_render_sparkline_no_results(self):
+        '''Nothing is added if the host has no results.'''
+        host = cping.protocols.Ping()('localhost')
+
+        window = unittest.mock.MagicMock()
+        cping.layouts.modern.Layout.render_sparkline(window, 1, 2, host, 5)
+
+        self.assertEqual(len(window.mock_calls), 0)
+
     def test_render_table(self):
         '''`render_table` should call `window.erase`, `window.addnstr`, and
-        `window.refresh`.'''
+        `window.noutrefresh`.'''
         host1 = cping.protocols.Ping()('host1')
         host2 = cping.protocols.Ping()('host2')
         table = cping.layouts.modern.get_table([host1, host2])
@@ -98,12 +195,19 @@ class TestLayout(unittest.TestCase):
 
         cping.layouts.modern.Layout.render_table(window, table, 0)
 
-        # Erase, 4x addnstr (header, 2x host, footer), refresh
+        # Erase, 4x addnstr (header, 2x host, footer), noutrefresh
         self.assertEqual(len(window.mock_calls), 6)
 
-        # Erase at the begining and refresh at the end
-        self.assertEqual(unittest.mock.call.erase(), window.mock_calls[0])
-        self.assertEqual(unittest.mock.call.refresh(), window.mock_calls[5])
+        # Erase at the begining, the rows in place, and noutrefresh at the end
+        call, anything = unittest.mock.call, unittest.mock.ANY
+        window.assert_has_calls([
+            call.erase(),
+            call.addnstr(0, 0, anything, 80, anything),
+            call.addnstr(1, 0, anything, 80, anything),
+            call.addnstr(2, 0, anything, 80, anything),
+            call.addnstr(23, 0, anything, 80, curses.A_STANDOUT),
+            call.noutrefresh(),
+        ])
 
         # The table is ordered correctly
         self.assertTrue(window.mock_calls[1][1][2].startswith(' HOST'))
@@ -115,6 +219,49 @@ class TestLayout(unittest.TestCase):
         header_attributes = window.mock_calls[1][1][4]
         self.assertEqual(header_attributes & curses.A_BOLD, curses.A_BOLD)
 
+    def test_render_table_changed_rows(self):
+        '''`render_table` should only redraw the rows that changed.'''
+        host1 = cping.protocols.Ping()('host1')
+        host2 = cping.protocols.Ping()('host2')
+
+        frame = {}
+        window = unittest.mock.MagicMock()
+        window.getmaxyx = lambda: (24, 80)
+
+        table = cping.layouts.modern.get_table([host1, host2])
+        cping.layouts.modern.Layout.render_table(window, table, 0, frame)
+        window.reset_mock()
+
+        # Only host2 changed; it's the only row that is redrawn
+        host2.add_result(-1)
+        table = cping.layouts.modern.get_table([host1, host2])
+        cping.layouts.modern.Layout.render_table(window, table, 0, frame)
+
+        self.assertNotIn(unittest.mock.call.erase(), window.mock_calls)
+        self.assertIn(unittest.mock.call.move(2, 0), window.mock_calls)
+        self.assertNotIn(unittest.mock.call.move(1, 0), window.mock_calls)
+
+    def test_render_table_selection_change(self):
+        '''Changing the selection should not redraw the sparklines.'''
+        host = cping.protocols.Ping()('host1')
+        host.add_result(0.1)
+
+        frame = {}
+        window = unittest.mock.MagicMock()
+        window.getmaxyx = lambda: (24, 80)
+
+        table = cping.layouts.modern.get_table([host])
+        cping.layouts.modern.Layout.render_table(window, table, 0, frame)
+        window.reset_mock()
+
+        table = cping.layouts.modern.get_table([host])
+        cping.layouts.modern.Layout.render_table(window, table, 1, frame)
+
+        # Header and host lines, and the footer; no sparkline or clearing
+        self.assertEqual(len(window.addnstr.mock_calls), 3)
+        self.assertFalse(window.addstr.called)
+        self.assertFalse(window.clrtoeol.called)
+
     def test_render_table_curses_error_handling(self):
         '''`render_table` should handle exceptions of `curses.error`.'''
 
@@ -125,52 +272,95 @@ class TestLayout(unittest.TestCase):
         window.erase = curses_error
         window.getmaxyx = lambda: (24, 80)
 
-        cping.layouts.modern.Layout.render_table(window, [], 0)
+        frame = {'size': (12, 40), 'rows': {}}
+        cping.layouts.modern.Layout.render_table(window, [], 0, frame)
 
         # The error canceled the rendering before any calls were made
         self.assertEqual(len(window.mock_calls), 0)
 
+        # The state is discarded so that the next frame is redrawn entirely
+        self.assertEqual(frame, {})
+
     def test_render(self):
         '''Ensure `render` sets the timeout of the window and clears the input
         buffers after `window.getch`.'''
+        window = unittest.mock.MagicMock()
+        window.getmaxyx = lambda: (24, 80)
 
-        def getch():
-            getch_trigger.wait()
-            return ord('q')
+        layout = cping.layouts.modern.Layout(cping.protocols.Ping())
+
+        with unittest.mock.patch('curses.flushinp') as flushinp:
 
-        flushinp_trigger = threading.Event()
-        getch_trigger = threading.Event()
+            def getch():
+                # Input buffers haven't been flushed before `window.getch`
+                self.assertFalse(flushinp.called)
+                return ord('q')
+
+            window.getch = getch
+            layout.render(window)
+
+            # Input buffers are flushed after `window.getch`
+            self.assertTrue(flushinp.called)
+
+        # Window timeout is set to the minimum frame interval
+        interval = int(cping.layouts.modern.FRAME_INTERVAL_MINIMUM * 1000)
+        self.assertIn(unittest.mock.call.timeout(interval), window.mock_calls)
+
+    def test_render_repeated(self):
+        '''Rendering again shouldn't patch the hosts' signals again.'''
+        layout = TestLayout.create_layout()
+        patched_set = layout.hosts[0].update_signal.set
 
         window = unittest.mock.MagicMock()
-        window.getch = getch
+        window.getch = lambda: ord('q')
         window.getmaxyx = lambda: (24, 80)
-        curses.flushinp = flushinp_trigger.set
 
+        layout.render(window)
+        layout.render(window)
+
+        self.assertIs(layout.hosts[0].update_signal.set, patched_set)
+
+    def test_render_flushinp(self):
+        '''The input buffer is only flushed after a key was pressed.'''
         layout = cping.layouts.modern.Layout(cping.protocols.Ping())
-        renderer = threading.Thread(target=layout.render, args=(window, ))
-        renderer.start()
+        window = unittest.mock.MagicMock()
+        window.getch = TestLayout.wrap_curses_getch([-1, -1, ord('a')])
+        window.getmaxyx = lambda: (24, 80)
 
-        # Input buffers are flushed after `window.getch`
-        self.assertFalse(flushinp_trigger.is_set())
-        getch_trigger.set()
-        self.assertTrue(flushinp_trigger.wait(0.5))
+        with unittest.mock.patch('curses.flushinp') as mock:
+            layout.render(window)
 
-        # Wait for the 'q' key to get processed once `getch_trigger` is set
-        renderer.join()
+            # The 'a' and 'q' keys; the two timeouts didn't flush
+            self.assertEqual(mock.call_count, 2)
 
-        # Window timeout is set to the protocol interval
-        interval = layout.protocol.interval * 1000
-        self.assertIn(unittest.mock.call.timeout(interval), window.mock_calls)
+    def test_render_host_update(self):
+        '''Without input, the table is only redrawn once a host is updated.'''
+        layout = cping.layouts.modern.Layout(cping.protocols.Ping(60))
+        host = layout.add_host('host1')
+        keys = []
+
+        def getch():
+            keys.append(-1)
+
+            # Update the host the second time around, then quit
+            if len(keys) == 2:
+                host.add_result(1)
+
+            return -1 if len(keys) < 3 else ord('q')
+
+        window = unittest.mock.MagicMock()
+        window.getch = getch
+        function = 'cping.layouts.modern.Layout.render_table'
+
+        with unittest.mock.patch(function) as mock:
+            layout.render(window)
+
+            # Startup render, then the render after the host update
+            self.assertEqual(mock.call_count, 2)
 
     def test_render_function_burst_mode(self):
         '''Enable/disable burst mode on a single host.'''
-        layout = cping.layouts.modern.Layout(cping.protocols.Ping())
-        layout.add_host('host1')
-        layout.add_host('host2')
-
-        for host in layout.hosts:
-            host.burst_mode.set = unittest.mock.MagicMock()
-            host.burst_mode.clear = unittest.mock.MagicMock()
+        layout = TestLayout.create_layout()
 
         keys = [curses.KEY_DOWN, ord('b')]
         window = unittest.mock.MagicMock()
@@ -186,13 +376,7 @@ class TestLayout(unittest.TestCase):
 
     def test_render_function_burst_mode_all(self):
         '''Enable/disable burst mode on all hosts.'''
-        layout = cping.layouts.modern.Layout(cping.protocols.Ping())
-        layout.add_host('host1')
-        layout.add_host('host2')
-
-        for host in layout.hosts:
-            host.burst_mode.set = unittest.mock.MagicMock()
-            host.burst_mode.clear = unittest.mock.MagicMock()
+        layout = TestLayout.create_layout()
 
         window = unittest.mock.MagicMock()
         window.getch = TestLayout.wrap_curses_getch([])
@@ -253,7 +437,7 @@ class TestLayout(unittest.TestCase):
         '''Ensure accepted sort keys are between 0 and 6.'''
         layout = cping.layouts.modern.Layout(cping.protocols.Ping())
 
-        keys = [ord(str(x)) for x in range(8)]
+        keys = list(range(ord('0'), ord('8')))
         window = unittest.mock.MagicMock()
         window.getch = TestLayout.wrap_curses_getch(keys)
         window.getmaxyx = lambda: (24, 80)
@@ -271,13 +455,7 @@ class TestLayout(unittest.TestCase):
 
     def test_render_function_start_stop(self):
         '''Start/stop a single host.'''
-        layout = cping.layouts.modern.Layout(cping.protocols.Ping())
-        layout.add_host('host1')
-        layout.add_host('host2')
-
-        for host in layout.hosts:
-            host.start = unittest.mock.MagicMock()
-            host.stop = unittest.mock.MagicMock()
+        layout = TestLayout.create_layout()
 
         keys = [curses.KEY_DOWN, ord('s')]
         window = unittest.mock.MagicMock()
@@ -302,13 +480,7 @@ class TestLayout(unittest.TestCase):
 
     def test_render_function_start_stop_all(self):
         '''Start/stop all hosts.'''
-        layout = cping.layouts.modern.Layout(cping.protocols.Ping())
-        layout.add_host('host1')
-        layout.add_host('host2')
-
-        for host in layout.hosts:
-            host.start = unittest.mock.MagicMock()
-            host.stop = unittest.mock.MagicMock()
+        layout = TestLayout.create_layout()
 
         window = unittest.mock.MagicMock()
         window.getch = TestLayout.wrap_curses_getch([ord('s')])
@@ -334,25 +506,43 @@ class TestLayout(unittest.TestCase):
 class TestGetHostColumns(unittest.TestCase):
     '''cping.layouts.modern.get_host_columns tests.'''
 
+    @classmethod
+    def setUpClass(cls):
+        cls.ping = cping.protocols.Ping()
+
+    def test_cache(self):
+        '''The columns are cached until the host changes.'''
+        host = self.ping('hi')
+        cache = weakref.WeakKeyDictionary()
+
+        with unittest.mock.patch('cping.layouts.modern._HOST_COLUMNS', cache):
+            columns = cping.layouts.modern.get_host_columns(host)
+            self.assertIs(cping.layouts.modern.get_host_columns(host), columns)
+
+            host.add_result(0.1)
+            columns = cping.layouts.modern.get_host_columns(host)
+            self.assertEqual(columns,
+                             ('hi', '100.00', '100.00', '100.00', '-  ', '0% '))
+
     def test_no_results(self):
         '''A host with no results should return place-holders in the stats.'''
-        host = cping.protocols.Ping()('hi')
+        host = self.ping('hi')
 
         columns = cping.layouts.modern.get_host_columns(host)
-        expected = ['hi'] + (['-  '] * 5)
+        expected = ('hi', ) + (('-  ', ) * 5)
 
         self.assertEqual(columns, expected)
 
     def test_results(self):
         '''Stats should have 2 decimal places, or a percentage for `loss`.'''
-        host = cping.protocols.Ping()('hi')
+        host = self.ping('hi')
         host.add_result(-1)
         host.add_result(0.1)
         host.add_result(0.2)
         host.add_result(0.3)
 
         columns = cping.layouts.modern.get_host_columns(host)
-        expected = ['hi', '100.00', '200.00', '300.00', '100.00', '25% ']
+        expected = ('hi', '100.00', '200.00', '300.00', '100.00', '25% ')
 
         self.assertEqual(columns, expected)
 
@@ -382,22 +572,27 @@ class TestGetTablePage(unittest.TestCase):
 class TestGetTable(unittest.TestCase):
     '''cping.layouts.modern.get_table tests.'''
 
-    def test_column_width(self):
-        '''The columns should all have equal lengths among the rows.'''
-        hosts = [cping.protocols.Ping()(str(x)) for x in range(3)]
-        table = cping.layouts.modern.get_table(hosts)
+    @classmethod
+    def setUpClass(cls):
+        cls.ping = cping.protocols.Ping()
 
+    def test_column_width(self):
+        '''The columns should be aligned among the rows.'''
+        hosts = [self.ping(str(x)) for x in range(3)]
         hosts[0].add_result(1000)
 
-        for index, column in enumerate(table[0]['columns']):
-            column_width = len(column)
+        table = cping.layouts.modern.get_table(hosts)
+
+        # Every column is padded to the widest value among the rows
+        for row in table:
+            self.assertEqual(len(row['line']), len(table[0]['line']))
 
-            for row in table:
-                self.assertEqual(len(row['columns'][index]), column_width)
+        self.assertTrue(table[1]['line'].startswith('0       1000000.00'))
+        self.assertTrue(table[2]['line'].startswith('1              -  '))
 
     def test_header(self):
         '''Confirm the table starts with the header.'''
-        hosts = [cping.protocols.Ping()(str(x)) for x in range(3)]
+        hosts = [self.ping(str(x)) for x in range(3)]
         table = cping.layouts.modern.get_table(hosts)
         header = ['HOST', 'MIN', 'AVG', 'MAX', 'STD', 'LOSS']
 
@@ -406,21 +601,17 @@ class TestGetTable(unittest.TestCase):
 
     def test_host_running(self):
         '''A running host should have different attributes than a stopped one.'''
-        host1 = cping.protocols.Ping()('1')
-        host2 = cping.protocols.Ping()('2')
-
-        trigger = threading.Event()
-        host1.protocol.ping_loop = lambda _: trigger.wait()
-        host1.start()
+        host1 = self.ping('1')
+        host2 = self.ping('2')
+        host1.is_running = lambda: True
 
         table = cping.layouts.modern.get_table([host1, host2])
-        trigger.set()
 
         self.assertNotEqual(table[1]['attrs'], table[2]['attrs'])
 
     def test_host_status(self):
         '''Host status should be included in the table.'''
-        host = cping.protocols.Ping()('1')
+        host = self.ping('1')
         host.status = 'Some status'
         table = cping.layouts.modern.get_table([host])
 
@@ -445,29 +636,27 @@ class TestGetTableSortKey(unittest.TestCase):
 class TestSortHosts(unittest.TestCase):
     '''cping.layouts.modern.sort_hosts tests.'''
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+        cls.ping = cping.protocols.Ping()
+
+        # Shared among the tests as `sort_hosts` doesn't modify the hosts
+
         # min=1000, avg=2000, max=3000, stdev=1000, loss=0.0
-        self.host1 = cping.protocols.Ping()('host1')
-        self.host1.add_result(1)
-        self.host1.add_result(2)
-        self.host1.add_result(3)
+        cls.host1 = cls.ping('host1')
+        cls.host1.add_results([1, 2, 3])
 
         # min=3000, avg=3500, max=4000, stdev=707.10, loss=0.33
-        self.host2 = cping.protocols.Ping()('host22')
-        self.host2.add_result(3)
-        self.host2.add_result(4)
-        self.host2.add_result(-1)
+        cls.host2 = cls.ping('host22')
+        cls.host2.add_results([3, 4, -1])
 
         # min=500, avg=700, max=900, stdev=200, loss=0.25
-        self.host3 = cping.protocols.Ping()('host3')
-        self.host3.add_result(0.5)
-        self.host3.add_result(0.7)
-        self.host3.add_result(0.9)
-        self.host3.add_result(-1)
+        cls.host3 = cls.ping('host3')
+        cls.host3.add_results([0.5, 0.7, 0.9, -1])
 
     def test_no_results(self):
         '''Sorting with a host that has no results.'''
-        empty_host = cping.protocols.Ping()('host3')
+        empty_host = self.ping('host3')
         hosts = [self.host1, empty_host, self.host2]
 
         sorted_hosts = cping.layouts.modern.sort_hosts(hosts, 2)
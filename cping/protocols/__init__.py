@@ -1,11 +1,10 @@
 '''Generic code and base classes for ping protocols.'''
 import collections
 import errno
+import itertools
+import math
 import socket
-import statistics
 import threading
-import time
-from functools import lru_cache
 
 import cping.utils
 
@@ -41,20 +40,21 @@ class Host:
         self.raw_results = collections.deque(maxlen=RESULTS_LENGTH_MINIMUM)
 
         self._burst_mode = threading.Event()
+        self._changes = 0
+        self._changes_counter = itertools.count(1)
         self._name = name
         self._protocol = protocol
+        self._results_summary = (None, None)
         self._status = None
         self._stop_signal = threading.Event()
         self._test_thread = None
+        self._update_signal = threading.Event()
 
         self._ready_signal = cping.utils.create_shared_event(
             self._burst_mode,
             self._stop_signal,
         )
 
-        # Create seperate cache for each host
-        self._cached_results_summary = lru_cache()(self._get_results_summary)
-
     def __str__(self):
         return self._name
 
@@ -63,6 +63,13 @@ class Host:
         '''An instance of `threading.Event` to use burst mode when set.'''
         return self._burst_mode
 
+    @property
+    def changes(self):
+        '''A counter that is advanced whenever the results or the status
+        change; its values are never reused. Useful for detecting that the host
+        needs to be redrawn.'''
+        return self._changes
+
     @property
     def name(self):
         '''Ping destination.'''
@@ -95,8 +102,14 @@ class Host:
 
         Depending on the number of results, some may be `None`. The unit is ms.
         '''
-        # Call the caching function to avoid calculating on every call
-        return self._cached_results_summary()
+        # The summary is cached with the value of `changes` it was calculated
+        # at; a change during the calculation leaves it stale for the next call
+        changes = self._changes
+
+        if self._results_summary[0] != changes:
+            self._results_summary = (changes, self._get_results_summary())
+
+        return self._results_summary[1]
 
     @property
     def status(self):
@@ -109,12 +122,19 @@ class Host:
             raise TypeError('status must be a string')
 
         self._status = value
+        self._mark_changed()
 
     @property
     def stop_signal(self):
         '''Instance of `threading.Event` to signal to the test to stop.'''
         return self._stop_signal
 
+    @property
+    def update_signal(self):
+        '''Instance of `threading.Event` that is set whenever the results or the
+        status change. Clearing it is left to the consumer.'''
+        return self._update_signal
+
     def _get_results_summary(self):
         '''Intermediate function to the `results_summary` property.'''
         summary = {
@@ -125,20 +145,52 @@ class Host:
             'loss': None,
         }
 
+        # Copied and filtered once; used for the latencies and the loss
+        results = self.results
+
         # Remove failed pings and only get the latency value
-        results = [x['latency'] for x in self.results if x['latency'] >= 0]
+        latencies = [x['latency'] for x in results if x['latency'] >= 0]
+
+        if latencies:
+            mean = sum(latencies) / len(latencies)
 
-        if results:
-            summary['min'] = min(results) * 1000
-            summary['avg'] = sum(results) / len(results) * 1000
-            summary['max'] = max(results) * 1000
-            summary['loss'] = (1 - (len(results) / len(self.results)))
+            summary['min'] = min(latencies) * 1000
+            summary['avg'] = mean * 1000
+            summary['max'] = max(latencies) * 1000
+            summary['loss'] = (1 - (len(latencies) / len(results)))
 
-            if len(results) > 1:
-                summary['stdev'] = statistics.stdev(results) * 1000
+            # Sample standard deviation; floats are precise enough for latency
+            # and avoid the exact (fraction-based) arithmetic of `statistics`
+            if len(latencies) > 1:
+                deviations = sum((x - mean)**2 for x in latencies)
+                summary['stdev'] = math.sqrt(deviations /
+                                             (len(latencies) - 1)) * 1000
 
         return summary
 
+    def _mark_changed(self):
+        '''Advances `self.changes` and sets `self.update_signal`.'''
+        # Called from the ping loop and the ICMP receiver; unlike `+= 1`, taking
+        # the next value of the counter can't lose a concurrent change
+        self._changes = next(self._changes_counter)
+        self._update_signal.set()
+
+    @staticmethod
+    def _create_result(latency, error=False, hidden=False, info=None):
+        '''Returns a result dictionary; arguments are those of `add_result`.'''
+        if not isinstance(latency, (float, int)):
+            raise TypeError('latency must be a float')
+
+        if not isinstance(error, bool):
+            raise TypeError('error must be a boolean')
+
+        return {
+            'latency': latency,
+            'error': error,
+            'hidden': hidden,
+            'info': info
+        }
+
     def add_result(self, latency, error=False, hidden=False, info=None):
         '''Adds a result (a float that represents the latency of a ping reply).
 
@@ -153,24 +205,41 @@ class Host:
         Raises:
             TypeError: If `latency` is not a float. If `error` is not a boolean.
         '''
-        if not isinstance(latency, (float, int)):
-            raise TypeError('latency must be a float')
-
-        if not isinstance(error, bool):
-            raise TypeError('error must be a boolean')
-
-        result = {
-            'latency': latency,
-            'error': error,
-            'hidden': hidden,
-            'info': info
-        }
+        result = Host._create_result(latency, error, hidden, info)
 
         self.raw_results.append(result)
-        self._cached_results_summary.cache_clear()
+        self._mark_changed()
 
         return result
 
+    def add_results(self, latencies):
+        '''Adds a result for each of the latencies, using the defaults of
+        `add_result`. The host is only marked as changed once.
+
+        Args:
+            latencies (iterable): Latencies (float) of the ping replies.
+
+        Raises:
+            TypeError: If any of the latencies is not a float.
+        '''
+        results = [Host._create_result(latency) for latency in latencies]
+
+        self.raw_results.extend(results)
+        self._mark_changed()
+
+        return results
+
+    def update_result(self, result, **fields):
+        '''Updates the `fields` of a result previously returned by `add_result`.
+
+        Args:
+            result (dict): The result to update.
+            **fields (x=y): The keys and values to set in the result (e.g.
+                `latency=0.1`).
+        '''
+        result.update(fields)
+        self._mark_changed()
+
     def is_running(self):
         '''Returns `True` if the test is running. Otherwise, `False`.'''
         return self._test_thread is not None and self._test_thread.is_alive()
@@ -209,7 +278,9 @@ class Host:
             raise TypeError('delay must be a float')
 
         def ping_loop_wrapper():
-            time.sleep(delay)
+            # Interrupted if stopped during the delay (e.g. a staggered start)
+            if self.stop_signal.wait(delay):
+                return
 
             try:
                 self._protocol.ping_loop(self)
@@ -217,6 +288,7 @@ class Host:
                 self.status = exception.strerror or str(exception)
 
         self._status = None
+        self._mark_changed()
         self.stop_signal.clear()
 
         if not self.is_running():
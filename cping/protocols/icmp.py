@@ -1,7 +1,7 @@
 '''ICMP echo ping.'''
 import array
 import random
-import select
+import selectors
 import socket
 import struct
 import sys
@@ -12,6 +12,13 @@ import cping.protocols
 
 SOCKET_TYPE = socket.SOCK_RAW if sys.platform == 'win32' else socket.SOCK_DGRAM
 
+# Flag to read from a socket without blocking; not available on Windows
+RECEIVE_NONBLOCKING = getattr(socket, 'MSG_DONTWAIT', None)
+
+# Receive buffer (bytes) of the ICMP sockets, which are shared by all hosts, to
+# hold a burst of replies; the OS may cap it (e.g. `net.core.rmem_max`)
+RECEIVE_BUFFER_SIZE = 4 * 1024 * 1024
+
 
 class Ping(cping.protocols.Ping):
     '''ICMP echo ping. The possible results:
@@ -30,6 +37,14 @@ class Ping(cping.protocols.Ping):
             Ping.icmpv6_socket = socket.socket(socket.AF_INET6, SOCKET_TYPE,
                                                socket.IPPROTO_ICMPV6)
 
+            # Best effort; BSDs reject sizes above `kern.ipc.maxsockbuf`
+            for icmp_socket in [Ping.icmpv4_socket, Ping.icmpv6_socket]:
+                try:
+                    icmp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                           RECEIVE_BUFFER_SIZE)
+                except OSError:
+                    pass
+
             # Begin listening on the ICMP sockets. Daemonized to exit with cping
             threading.Thread(target=Ping.receiver, daemon=True).start()
 
@@ -39,51 +54,91 @@ class Ping(cping.protocols.Ping):
     def receiver():
         '''Handles incoming ICMPv4 and ICMPv6 sockets for packets by signalling
         the respective host's ping loop or updating late replies.'''
-        icmp_sockets = [Ping.icmpv4_socket, Ping.icmpv6_socket]
+        # Registered once instead of passing the sockets on every wait
+        selector = selectors.DefaultSelector()
+        selector.register(Ping.icmpv4_socket, selectors.EVENT_READ)
+        selector.register(Ping.icmpv6_socket, selectors.EVENT_READ)
+
+        # Reused for every packet instead of allocating one per packet
+        buffer = memoryview(bytearray(8192))
 
         while True:
             # Block until there is at least one socket ready to be read
-            protocol_socket = select.select(icmp_sockets, [], [])[0][0]
+            for key, _ in selector.select():
+                for data in Ping.read_socket(key.fileobj, buffer):
+                    Ping.receive_reply(data)
 
-            # Strip the ICMP reply as macOS includes the IPv4 header in data
-            # pylint: disable=invalid-unary-operand-type  # linter bug
-            data = protocol_socket.recv(8192)[-Session.packet_struct.size:]
+    @staticmethod
+    def read_socket(icmp_socket, buffer):
+        '''Yields the packets queued on the socket, starting with the one that
+        made it ready. A burst of replies is read without waiting for the socket
+        to be ready again, except on platforms without `socket.MSG_DONTWAIT`.
 
-            # Malformed packet
-            if len(data) < Session.packet_struct.size:
-                continue
+        Args:
+            icmp_socket (socket.socket): A socket that is ready to be read.
+            buffer (memoryview): The buffer into which the packets are read. A
+                yielded packet is a view of it, valid until the next one.
+        '''
+        yield buffer[:icmp_socket.recv_into(buffer)]
 
-            packet = Session.packet_struct.unpack(data)
-            sequence, identifier, timestamp = packet[-3:]
+        if RECEIVE_NONBLOCKING is None:
+            return
 
-            # Unknown packet
-            if identifier not in Ping.host_map:
-                continue
+        while True:
+            try:
+                size = icmp_socket.recv_into(buffer, 0, RECEIVE_NONBLOCKING)
+            except BlockingIOError:
+                return
 
-            latency = time.perf_counter() - timestamp
-            host, event, interval = Ping.host_map[identifier]
+            yield buffer[:size]
 
-            # Search through all of the results, including the hidden ones
-            # Reversed to ensure duplicate sequences are access in LIFO order
-            for result in reversed(host.raw_results):
-                if result['info'] == (identifier, sequence):
-                    result['latency'] = latency
+    @staticmethod
+    def receive_reply(data):
+        '''Matches the ICMP echo reply in `data` to its result, updating it.
 
-                    # Reply arrived on time; inform the host's ping loop to continue
-                    if latency <= interval:
-                        event.set()
-                    # Late reply; the ping loop is already in the next iteration
-                    else:
-                        result['error'] = True
+        Args:
+            data (bytes-like): The packet received on the ICMP socket.
+        '''
+        # The ICMP reply is at the end as macOS includes the IPv4 header in data
+        offset = len(data) - Session.packet_struct.size
 
-                    break
+        # Malformed packet
+        if offset < 0:
+            return
+
+        packet = Session.packet_struct.unpack_from(data, offset)
+        sequence, identifier, timestamp = packet[-3:]
+
+        # Unknown packet
+        if identifier not in Ping.host_map:
+            return
+
+        latency = time.perf_counter() - timestamp
+        host, event, interval, requests = Ping.host_map[identifier]
+        result = requests.get(sequence)
+
+        # The result is no longer tracked (e.g. the sequence is too old)
+        if result is None:
+            return
+
+        # Reply arrived on time; inform the host's ping loop to continue
+        if latency <= interval:
+            host.update_result(result, latency=latency)
+            event.set()
+        # Late reply; the ping loop is already in the next iteration
+        else:
+            host.update_result(result, latency=latency, error=True)
 
     def ping_loop(self, host):
         addrinfo = self.resolve(host)
         session = Session(4 if addrinfo[0] == socket.AF_INET else 6)
         receive_event = threading.Event()
 
-        Ping.host_map[session.identifier] = host, receive_event, self.interval
+        # The results of the requests, keyed by sequence, in the order sent
+        requests = {}
+
+        Ping.host_map[session.identifier] = (host, receive_event, self.interval,
+                                             requests)
 
         while not host.stop_signal.is_set():
             receive_event.clear()
@@ -94,6 +149,14 @@ class Ping(cping.protocols.Ping):
                                      hidden=True,
                                      info=(session.identifier, sequence))
 
+            # A reused sequence refers to the latest request (moved to the end)
+            requests.pop(sequence, None)
+            requests[sequence] = result
+
+            # Only track as many requests as the host keeps results
+            if len(requests) > host.raw_results.maxlen:
+                requests.pop(next(iter(requests)))
+
             try:
                 if addrinfo[0] == socket.AF_INET:
                     Ping.icmpv4_socket.sendto(request, addrinfo[4])
@@ -108,7 +171,7 @@ class Ping(cping.protocols.Ping):
                 else:
                     raise
 
-            result['hidden'] = False
+            host.update_result(result, hidden=False)
 
             # Block until signaled to continue
             host.wait(result['latency'])
@@ -121,6 +184,9 @@ class Session:
     # The final `Hd` is the data, containing the identifier and the timestamp
     packet_struct = struct.Struct('!BBHHHHd')
 
+    # The fields of the packet that change between requests: sequence and data
+    request_struct = struct.Struct('!HHd')
+
     def __init__(self, family):
         '''Constructor.
 
@@ -138,6 +204,14 @@ class Session:
             if self.identifier not in Ping.host_map:
                 break
 
+        # The type, code, and identifier don't change between requests; neither
+        # does their share of the checksum
+        self.header = (
+            struct.pack('!BB', self.packet_type, 0),
+            struct.pack('!H', self.identifier),
+        )
+        self.header_sum = sum(array.array('H', b''.join(self.header)))
+
     @staticmethod
     def get_checksum(data):
         '''Returns checksum of `data`. Not meant for ICMPv6 as that requires an IPv6
@@ -149,9 +223,10 @@ class Session:
         # The sum of the data, split into 16-bit words
         checksum = sum(array.array('H', data))
 
-        # End-around carry the sum to 16 bits
-        while checksum >> 16:
-            checksum = (checksum & 0xffff) + (checksum >> 16)
+        # End-around carry the sum to 16 bits. Two folds suffice for a sum below
+        # 2**32 (i.e. data under 128 KiB; an IP packet is at most 64 KiB)
+        checksum = (checksum & 0xffff) + (checksum >> 16)
+        checksum = (checksum & 0xffff) + (checksum >> 16)
 
         # One's complement of the sum, normalized to 16 bits
         return struct.pack('!H', socket.htons(~checksum & 0xffff))
@@ -162,12 +237,16 @@ class Session:
 
         # The data contains another copy of the identifier as the one in the
         # header is stripped in some Linux distributions
-        request = Session.packet_struct.pack(self.packet_type, 0, 0,
-                                             self.identifier, self.sequence,
-                                             self.identifier,
-                                             time.perf_counter())
+        request = Session.request_struct.pack(self.sequence, self.identifier,
+                                              time.perf_counter())
+
+        # Same as `get_checksum`, but the header's share is precalculated
+        checksum = self.header_sum + sum(array.array('H', request))
+        checksum = (checksum & 0xffff) + (checksum >> 16)
+        checksum = (checksum & 0xffff) + (checksum >> 16)
 
-        # Checksum is calculated with the checksum in the header set to 0
-        request = request[:2] + Session.get_checksum(request) + request[4:]
+        # Native byte order; equivalent to `struct.pack('!H', socket.htons(x))`
+        checksum = struct.pack('=H', ~checksum & 0xffff)
+        request = self.header[0] + checksum + self.header[1] + request
 
         return request, self.sequence
@@ -57,6 +57,67 @@ class TestHost(unittest.TestCase):
         with self.assertRaisesRegex(TypeError, 'error must be a boolean'):
             host.add_result(1, 1)
 
+    def test_add_results(self):
+        '''Add multiple results at once.'''
+        host = cping.protocols.Ping()('localhost')
+        changes = host.changes
+        host.add_results([1, 2, -1])
+
+        self.assertEqual([x['latency'] for x in host.results], [1, 2, -1])
+        self.assertEqual(host.changes, changes + 1)
+        self.assertAlmostEqual(host.results_summary['loss'], 1 / 3)
+
+    def test_add_results_invalid_type_latency(self):
+        '''Add results with an invalid latency type; none are added.'''
+        host = cping.protocols.Ping()('localhost')
+
+        with self.assertRaisesRegex(TypeError, 'latency must be a float'):
+            host.add_results([1, 'hi'])
+
+        self.assertEqual(len(host.raw_results), 0)
+
+    def test_changes(self):
+        '''The changes counter increments when the results or status change.'''
+        host = cping.protocols.Ping()('localhost')
+        changes = host.changes
+
+        result = host.add_result(1, hidden=True)
+        self.assertGreater(host.changes, changes)
+        changes = host.changes
+
+        host.update_result(result, hidden=False)
+        self.assertGreater(host.changes, changes)
+        changes = host.changes
+
+        host.status = 'Some status'
+        self.assertGreater(host.changes, changes)
+
+    def test_update_signal(self):
+        '''The update signal is set when the results or status change.'''
+        host = cping.protocols.Ping()('localhost')
+        self.assertFalse(host.update_signal.is_set())
+
+        result = host.add_result(1, hidden=True)
+        self.assertTrue(host.update_signal.is_set())
+        host.update_signal.clear()
+
+        host.update_result(result, hidden=False)
+        self.assertTrue(host.update_signal.is_set())
+        host.update_signal.clear()
+
+        host.status = 'Some status'
+        self.assertTrue(host.update_signal.is_set())
+
+    def test_update_result(self):
+        '''Update a result and clear the cached summary.'''
+        host = cping.protocols.Ping()('localhost')
+        result = host.add_result(-1, hidden=True)
+        self.assertEqual(host.results_summary['min'], None)
+
+        host.update_result(result, latency=1, hidden=False)
+        self.assertEqual(host.results, [result])
+        self.assertEqual(host.results_summary['min'], 1000)
+
     def test_is_running(self):
         '''Confirm that the host correctly detects when the loop is running.'''
         host = cping.protocols.Ping()('localhost')
@@ -73,6 +134,18 @@ class TestHost(unittest.TestCase):
         host._test_thread.join()
         self.assertFalse(host.is_running())
 
+    def test_results_summary_cache(self):
+        '''The summary is cached until the host changes.'''
+        host = cping.protocols.Ping()('localhost')
+        host.add_result(1)
+        summary = host.results_summary
+
+        self.assertIs(host.results_summary, summary)
+
+        host.add_result(2)
+        self.assertIsNot(host.results_summary, summary)
+        self.assertEqual(host.results_summary['max'], 2000)
+
     def test_results_summary(self):
         '''Get the statistics on the results.'''
         host = cping.protocols.Ping()('localhost')
@@ -160,6 +233,18 @@ class TestHost(unittest.TestCase):
         host._test_thread.join()
         self.assertTrue(host.stop_signal.is_set())
 
+    def test_start_delay_stopped(self):
+        '''Stopping the host during the delay should not start ping_loop.'''
+        host = cping.protocols.Ping()('localhost')
+        host.protocol.ping_loop = unittest.mock.MagicMock()
+
+        checkpoint = time.perf_counter()
+        host.start(delay=10)
+        host.stop(block=True)
+
+        self.assertLess(time.perf_counter() - checkpoint, 1)
+        self.assertFalse(host.protocol.ping_loop.called)
+
     def test_start_invalid_type_delay(self):
         '''Start host with a delay of an invalid type.'''
         with self.assertRaisesRegex(TypeError, 'delay must be a float'):
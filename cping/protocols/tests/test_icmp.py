@@ -1,5 +1,6 @@
 '''cping.protocols.icmp tests'''
 import collections
+import threading
 import time
 import unittest
 import unittest.mock
@@ -16,6 +17,22 @@ class TestPing(unittest.TestCase):
         protocol = cping.protocols.icmp.Ping()
         cping.protocols.tests.ping_change_interval(self, protocol)
 
+    def test_receive_buffer_size_rejected(self):
+        '''An OS rejecting the receive buffer size shouldn't break the sockets.'''
+        icmp_socket = unittest.mock.MagicMock()
+        icmp_socket.setsockopt.side_effect = OSError
+
+        sockets = {'icmpv4_socket': None, 'icmpv6_socket': None}
+        ping = cping.protocols.icmp.Ping
+
+        with unittest.mock.patch.multiple(ping, **sockets):
+            with unittest.mock.patch('socket.socket', return_value=icmp_socket):
+                with unittest.mock.patch('threading.Thread'):
+                    ping()
+
+                self.assertIs(ping.icmpv4_socket, icmp_socket)
+                self.assertEqual(icmp_socket.setsockopt.call_count, 2)
+
     def test_host_not_responding(self):
         '''Nothing is sent back.'''
         host = cping.protocols.icmp.Ping(0.2)('1.2.3.4')
@@ -60,6 +77,64 @@ class TestPing(unittest.TestCase):
         protocol = cping.protocols.icmp.Ping()
         protocol.icmpv6_socket.sendto(request[:8], ('::1', 0))
 
+    def test_read_socket(self):
+        '''All of the queued packets are read, stopping once none are left.'''
+        buffer = memoryview(bytearray(8))
+        function = 'cping.protocols.icmp.RECEIVE_NONBLOCKING'
+
+        def recv_into(packets):
+            # Write the next packet into the buffer, like `socket.recv_into`
+            def wrapper(view, *_):
+                packet = next(packets, None)
+
+                if packet is None:
+                    raise BlockingIOError()
+
+                view[:len(packet)] = packet
+                return len(packet)
+
+            return wrapper
+
+        for flag, expected in [(64, [b'1', b'22']), (None, [b'1'])]:
+            icmp_socket = unittest.mock.MagicMock()
+            icmp_socket.recv_into = recv_into(iter([b'1', b'22']))
+
+            # Without the flag, only the packet that made the socket ready
+            with unittest.mock.patch(function, flag):
+                packets = cping.protocols.icmp.Ping.read_socket(
+                    icmp_socket, buffer)
+
+                # Copied as the buffer is reused by the next packet
+                packets = [bytes(x) for x in packets]
+                self.assertEqual(packets, expected)
+
+    def test_receive_reply(self):
+        '''A reply updates the result of the request with the same sequence.'''
+        host = cping.protocols.Ping()('localhost')
+        session = cping.protocols.icmp.Session(4)
+        event = threading.Event()
+
+        request, sequence = session.create_icmp_echo()
+        result = host.add_result(-1, hidden=True)
+        entry = (host, event, 1, {sequence: result})
+
+        with unittest.mock.patch.dict(cping.protocols.icmp.Ping.host_map,
+                                      {session.identifier: entry}):
+            # An unknown sequence is ignored
+            cping.protocols.icmp.Ping.receive_reply(
+                session.create_icmp_echo()[0])
+            self.assertFalse(event.is_set())
+
+            # A malformed (truncated) packet is ignored
+            cping.protocols.icmp.Ping.receive_reply(request[1:])
+            self.assertFalse(event.is_set())
+
+            # The reply may be preceded by the IPv4 header (e.g. on macOS)
+            cping.protocols.icmp.Ping.receive_reply(b'\x00' * 20 + request)
+            self.assertTrue(event.is_set())
+            self.assertNotEqual(result['latency'], -1)
+            self.assertFalse(result['error'])
+
     def test_unknown_host(self):
         '''A packet with an unknown identifier should be ignored.'''
         session = cping.protocols.icmp.Session(6)
@@ -100,8 +175,30 @@ class TestPing(unittest.TestCase):
 class TestSession(unittest.TestCase):
     '''cping.protocols.icmp.Session tests.'''
 
+    def test_create_icmp_echo_checksum(self):
+        '''The checksum of the request should match that of `get_checksum`.'''
+        session = cping.protocols.icmp.Session(4)
+
+        for _ in range(3):
+            request, _ = session.create_icmp_echo()
+            checksum = cping.protocols.icmp.Session.get_checksum(
+                request[:2] + b'\x00\x00' + request[4:])
+
+            self.assertEqual(request[2:4], checksum)
+            self.assertEqual(len(request), session.packet_struct.size)
+
     def test_get_checksum_odd_sized(self):
         '''Ensure that odd-lengthed data is padded accordingly.'''
         even = cping.protocols.icmp.Session.get_checksum(b'\x01\x02\x03\x00')
         odd = cping.protocols.icmp.Session.get_checksum(b'\x01\x02\x03')
         self.assertEqual(even, odd)
+
+    def test_get_checksum_carry(self):
+        '''The carry of the first fold should be folded back into the sum.'''
+        # The sum of the words is 0x1fffe, whose first fold carries again
+        checksum = cping.protocols.icmp.Session.get_checksum(b'\xff\xff' * 2)
+        self.assertEqual(checksum, b'\x00\x00')
+
+        # The maximum size of an IP packet
+        checksum = cping.protocols.icmp.Session.get_checksum(b'\xff' * 65535)
+        self.assertEqual(checksum, b'\x00\xff')
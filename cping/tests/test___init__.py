@@ -0,0 +1,29 @@
+'''cping tests'''
+import unittest
+
+import cping
+import cping.layouts.modern
+import cping.protocols.tcp
+
+
+class TestLazyImports(unittest.TestCase):
+    '''cping.__getattr__ tests.'''
+
+    def test_known_name(self):
+        '''The public classes are imported on access.'''
+        self.assertIs(cping.LayoutModern, cping.layouts.modern.Layout)
+        self.assertIs(cping.PingTCP, cping.protocols.tcp.Ping)
+        self.assertIn('PingICMP', dir(cping))
+
+    def test_dir(self):
+        '''The public classes are listed once, whether imported or not.'''
+        cping.PingTCP  # pylint: disable=pointless-statement
+        names = dir(cping)
+
+        self.assertEqual(names.count('PingTCP'), 1)
+        self.assertEqual(names.count('PingICMP'), 1)
+
+    def test_unknown_name(self):
+        '''An unknown name raises AttributeError.'''
+        with self.assertRaisesRegex(AttributeError, 'no attribute .Hello.'):
+            cping.Hello  # pylint: disable=pointless-statement
@@ -15,6 +15,17 @@ import cping.__main__
 import cping.utils
 
 
+class TestArgsParser(unittest.TestCase):
+    '''cping.__main__.args_parser tests.'''
+
+    def test_cache(self):
+        '''The parser is reused for the same platform.'''
+        parser = cping.__main__.args_parser('linux')
+
+        self.assertIs(cping.__main__.args_parser('linux'), parser)
+        self.assertIsNot(cping.__main__.args_parser('win32'), parser)
+
+
 class TestMain(unittest.TestCase):
     '''cping.__main__.main tests.'''
 
@@ -97,6 +108,16 @@ class TestMain(unittest.TestCase):
             except KeyboardInterrupt:  # pragma: no cover
                 self.fail('KeyboardInterrupt not caught by main')
 
+    def test_hosts_stopped(self):
+        '''The hosts are signaled to stop once the layout exits.'''
+        with unittest.mock.patch('cping.PingTCP.ping_loop', lambda *_: None):
+            with unittest.mock.patch('cping.LayoutLegacy.__call__',
+                                     autospec=True) as layout:
+                cping.__main__.main(['-l', 'legacy', '-p', '80', 'localhost'])
+                host = layout.call_args[0][0].hosts[0]
+
+                self.assertTrue(host.stop_signal.is_set())
+
     def test_ping_icmp(self):
         '''Use ICMP as the Ping class.'''
         trigger = threading.Event()
@@ -1,4 +1,5 @@
 '''cping.utils tests'''
+import math
 import threading
 import time
 import unittest
@@ -59,6 +60,21 @@ class TestGenerateData(unittest.TestCase):
         self.assertEqual(data, '12')
 
 
+class TestNaturalOrderingSortKey(unittest.TestCase):
+    '''cping.utils.natural_ordering_sort_key tests.'''
+    def test_ordering(self):
+        '''Numbers are compared as integers.'''
+        hosts = ['host10', 'host9', 'Host1']
+        hosts.sort(key=cping.utils.natural_ordering_sort_key)
+        self.assertEqual(hosts, ['Host1', 'host9', 'host10'])
+
+    def test_immutable(self):
+        '''A tuple is returned as the key is cached.'''
+        key = cping.utils.natural_ordering_sort_key('host1')
+        self.assertEqual(key, ('host', 1, ''))
+        self.assertIs(cping.utils.natural_ordering_sort_key('host1'), key)
+
+
 class TestSparklinePoint(unittest.TestCase):
     '''cping.utils.sparkline_point tests.'''
     base = 0x2581
@@ -85,6 +101,49 @@ class TestSparklinePoint(unittest.TestCase):
         self.assertGreater(ord(point), self.base)
 
 
+class TestSparklinePoints(unittest.TestCase):
+    '''cping.utils.sparkline_points tests.'''
+
+    @staticmethod
+    def reference_point(value, minimum, maximum, stdev=None):
+        '''The original, per-value calculation of a sparkline point.'''
+        normalized_value = 0
+        stable_stdev = cping.utils.SPARKLINE_STABLE_STDEV
+
+        if maximum != minimum:
+            normalized_value = (value - minimum) / (maximum - minimum)
+
+        if isinstance(stdev, float) and stdev < stable_stdev:
+            normalized_value = ((1.0 - 0.2) * normalized_value) + 0.2
+
+        scaled_value = math.log(max((normalized_value * 10), 1), 10)
+
+        return chr(0x2581 + round(scaled_value * 6))
+
+    def test_equivalence(self):
+        '''Should match the original calculation for values within the range.'''
+        values = [x / 100 for x in range(100, 501)]
+
+        for stdev in (None, 0.1, 10.0):
+            points = cping.utils.sparkline_points(values, 1, 5, stdev)
+            expected = ''.join(
+                self.reference_point(x, 1, 5, stdev) for x in values)
+            self.assertEqual(points, expected)
+
+        # Equal minimum and maximum
+        points = cping.utils.sparkline_points([1, 1], 1, 1)
+        self.assertEqual(points, self.reference_point(1, 1, 1) * 2)
+
+    def test_above_maximum(self):
+        '''A value above the maximum should be clamped to the highest point.'''
+        points = cping.utils.sparkline_points([2, 3, 100], 1, 2)
+        self.assertEqual(points, chr(0x2581 + 6) * 3)
+
+    def test_empty(self):
+        '''No values should return an empty string.'''
+        self.assertEqual(cping.utils.sparkline_points([], 1, 2), '')
+
+
 class TestStaggerStart(unittest.TestCase):
     '''cping.utils.stagger_start tests.'''
     def test_timing(self):
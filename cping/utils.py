@@ -1,11 +1,19 @@
 '''Utility code (stub module)'''
-import math
+import bisect
+import functools
 import re
 import threading
+import time
 
 DATA_LENGTH = 24
 SPARKLINE_STABLE_STDEV = 5
 
+# Unicode blocks (they're in hex): https://w.wiki/zKh
+SPARKLINE_POINTS = ''.join(chr(0x2581 + x) for x in range(7))
+
+# The normalized values at which the point changes when scaled logarithmicly
+SPARKLINE_THRESHOLDS = tuple(10**((x + 0.5) / 6 - 1) for x in range(6))
+
 
 def create_shared_event(*events):
     '''Returns an instance of `threading.Event` which will become set when any of
@@ -45,10 +53,13 @@ def generate_data(length=DATA_LENGTH, data=b':github.com/hSaria/cPing'):
     return (data * (length // len(data) + 1))[:length]
 
 
+@functools.lru_cache(maxsize=1024)
 def natural_ordering_sort_key(string, _regex=re.compile(r'(\d+)')):
-    '''Returns a list containing the `string`, but with the numbers converted
-    into integers. Meant to be used as a natural-sorting key.'''
-    return [int(x) if x.isdigit() else x for x in _regex.split(string.lower())]
+    '''Returns a tuple containing the `string`, but with the numbers converted
+    into integers. Meant to be used as a natural-sorting key. Cached as the
+    same strings (e.g. host names) are sorted repeatedly.'''
+    return tuple(
+        int(x) if x.isdigit() else x for x in _regex.split(string.lower()))
 
 
 def sparkline_point(value, minimum, maximum, stdev=None):
@@ -62,23 +73,33 @@ def sparkline_point(value, minimum, maximum, stdev=None):
         maximum (float): the maximum value in the data set
         stdev (float): the standard deviation of the data set
     '''
-    if maximum == minimum:
-        # Avoid divide-by-zero when there's only one data point
-        normalized_value = 0
-    else:
-        # The value between 0 and 1 relative to the minimum and maximum
-        normalized_value = (value - minimum) / (maximum - minimum)
+    return sparkline_points((value, ), minimum, maximum, stdev)
+
+
+def sparkline_points(values, minimum, maximum, stdev=None):
+    '''Returns a string of `sparkline_point` for each of the `values`. The
+    normalization is calculated once for all of the values, instead of per value.
+
+    Args:
+        values (iterable): the values to normalize
+        minimum (float): the minimum value in the data set
+        maximum (float): the maximum value in the data set
+        stdev (float): the standard deviation of the data set
+    '''
+    # Avoid divide-by-zero when there's only one data point
+    scale = 0 if maximum == minimum else 1 / (maximum - minimum)
+    offset = 0
 
     # The range of value falls under the stable delta range
     if isinstance(stdev, float) and stdev < SPARKLINE_STABLE_STDEV:
         # Distribute between 0.2 and 1.0 to avoid sporadic sparklines
-        normalized_value = ((1.0 - 0.2) * normalized_value) + 0.2
-
-    # Scale the value logarithmicly between 0 and 1
-    scaled_value = math.log(max((normalized_value * 10), 1), 10)
+        scale, offset = (1.0 - 0.2) * scale, 0.2
 
-    # Unicode blocks (they're in hex): https://w.wiki/zKh
-    return chr(0x2581 + round(scaled_value * 6))
+    # Equivalent to `round(math.log(max(normalized_value * 10, 1), 10) * 6)`
+    return ''.join(SPARKLINE_POINTS[bisect.bisect(
+        SPARKLINE_THRESHOLDS,
+        (value - minimum) * scale + offset,
+    )] for value in values)
 
 
 def stagger_start(hosts, interval):
@@ -94,6 +115,10 @@ def stagger_start(hosts, interval):
         interval (float): The duration over which the hosts are started.
     '''
     stagger_interval = interval / len(hosts)
+    checkpoint = time.perf_counter()
 
     for index, host in enumerate(hosts):
-        host.start(delay=stagger_interval * index)
+        # Offset from a fixed checkpoint so the time spent starting the
+        # previous hosts' threads doesn't accumulate as drift
+        elapsed = time.perf_counter() - checkpoint
+        host.start(delay=max(stagger_interval * index - elapsed, 0))